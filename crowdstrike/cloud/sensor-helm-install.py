@@ -26,35 +26,61 @@ Features:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import atexit
 import base64
+import concurrent.futures
+import functools
+import hashlib
 import json
 import os
+import re
+import select
+import shlex
 import shutil
+import socket
 import subprocess
 import sys
+import tempfile
+import threading
 import time
 from dataclasses import dataclass, field, asdict
 from abc import ABC, abstractmethod
+from collections import defaultdict, deque
 from enum import Enum
 from pathlib import Path
 from subprocess import DEVNULL
-from typing import Any, Dict, List, Optional, Type
+from types import MappingProxyType
+from typing import Any, Deque, Dict, List, Optional, Type
 
-import requests
-import yaml
+# requests and yaml are imported where they are used; --help and --uninstall never need them
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 from rich.prompt import Confirm, InvalidResponse, Prompt
-from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+from rich.table import Table
+from rich.text import Text
+from rich.progress import BarColumn, Progress, SpinnerColumn, TaskID, TextColumn, TimeElapsedColumn
 
 # --- Constants ---
 # Configuration paths
 CONFIG_DIR = Path.home() / ".config" / "iitd" / "csf"
 CONFIG_FILE = CONFIG_DIR / "falcon-deployment-config.json"
+CACHE_DIR = CONFIG_DIR / "cache"
+CREDENTIALS_CACHE_FILE = CACHE_DIR / "registry-credentials.json"
+DOCKER_CONFIG_FILE = Path.home() / ".docker" / "config.json"
 
 # Tooling versions
 MIN_HELM_VERSION = "3.0.0"
 MIN_KUBECTL_VERSION = "1.20.0"
+_VERSION_RE = re.compile(r"(\d+\.\d+\.\d+)")
+_VERSION_KEY_RE = re.compile(r"v?(\d+(?:[.-]\d+)*)")
+_DIGITS_RE = re.compile(r"\d+")
+
+# Wizard input formats
+_CID_RE = re.compile(r"[0-9A-Fa-f]{32}-[0-9A-Fa-f]{2}")
+_CLIENT_ID_RE = re.compile(r"[0-9A-Fa-f]{32}")
+_REGISTRY_RE = re.compile(r"[A-Za-z0-9.-]+(?::\d+)?(?:/[A-Za-z0-9._/-]*)?")
 
 # Helm settings
 HELM_REPO_NAME = "crowdstrike"
@@ -66,11 +92,32 @@ DEFAULT_LOCAL_REGISTRY = "localhost:5000"
 LATEST_IMAGE_TAG_KEYWORD = "latest"
 
 # Timeouts and limits
+API_CONNECT_TIMEOUT_S = 5
 API_REQUEST_TIMEOUT_S = 30
+API_TIMEOUT = (API_CONNECT_TIMEOUT_S, API_REQUEST_TIMEOUT_S)
+TOKEN_EXPIRY_MARGIN_S = 60
+TAG_CACHE_TTL_S = 3600
+
+# Manifest media types accepted when probing a registry for an existing tag
+MANIFEST_ACCEPT = ", ".join((
+    "application/vnd.docker.distribution.manifest.v2+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.oci.image.index.v1+json",
+))
+MANIFEST_INDEX_TYPES = ("application/vnd.docker.distribution.manifest.list.v2+json", "application/vnd.oci.image.index.v1+json")
 NETWORK_CONNECTIVITY_TIMEOUT_S = 5
 NETWORK_CONNECTIVITY_PORT = 443
 KUBE_ROLLOUT_TIMEOUT = "120s"
+KUBE_REQUEST_TIMEOUT = "10s"
 KUBE_LOGS_TAIL_LINES = "50"
+MAX_PARALLEL_IMAGE_COPIES = 4
+VERIFY_TIMEOUT_S = 120
+VERSION_PROBE_TIMEOUT_S = 10
+OUTPUT_CHUNK_SIZE = 64 * 1024
+OUTPUT_FLUSH_INTERVAL_S = 0.05
+PROGRESS_REFRESH_PER_SECOND = 10
+IMAGE_OUTPUT_TAIL_LINES = 20
 
 # Kubernetes labels
 K8S_ENFORCE_LABEL = "pod-security.kubernetes.io/enforce=privileged"
@@ -78,21 +125,21 @@ K8S_AUDIT_LABEL = "pod-security.kubernetes.io/audit=privileged"
 K8S_WARN_LABEL = "pod-security.kubernetes.io/warn=privileged"
 
 # API and Network configurations
-CLOUD_API_CONFIGS = {
+CLOUD_API_CONFIGS = MappingProxyType({
     "us-1": ("api.crowdstrike.com", "us-1", "registry.crowdstrike.com"),
     "us-2": ("api.us-2.crowdstrike.com", "us-2", "registry.crowdstrike.com"),
     "eu-1": ("api.eu-1.crowdstrike.com", "eu-1", "registry.crowdstrike.com"),
     "us-gov-1": ("api.laggar.gcw.crowdstrike.com", "gov1", "registry.laggar.gcw.crowdstrike.com"),
     "us-gov-2": ("api.us-gov-2.crowdstrike.mil", "gov2", "registry.us-gov-2.crowdstrike.mil"),
-}
+})
 
-NETWORK_REQUIREMENTS = {
-    "us-1": ["ts01-b.cloudsink.net", "falcon.crowdstrike.com", "api.crowdstrike.com"],
-    "us-2": ["ts01-gyr-maverick.cloudsink.net", "falcon.us-2.crowdstrike.com", "api.us-2.crowdstrike.com"],
-    "eu-1": ["ts01-lanner-lion.cloudsink.net", "falcon.eu-1.crowdstrike.com", "api.eu-1.crowdstrike.com"],
-    "us-gov-1": ["ts01-laggar-gcw.cloudsink.net", "falcon.laggar.gcw.crowdstrike.com", "api.laggar.gcw.crowdstrike.com"],
-    "us-gov-2": ["ts01-us-gov-2.crowdstrike.mil", "falcon.us-gov-2.crowdstrike.mil", "api.us-gov-2.crowdstrike.mil"],
-}
+NETWORK_REQUIREMENTS = MappingProxyType({
+    "us-1": ("ts01-b.cloudsink.net", "falcon.crowdstrike.com", "api.crowdstrike.com"),
+    "us-2": ("ts01-gyr-maverick.cloudsink.net", "falcon.us-2.crowdstrike.com", "api.us-2.crowdstrike.com"),
+    "eu-1": ("ts01-lanner-lion.cloudsink.net", "falcon.eu-1.crowdstrike.com", "api.eu-1.crowdstrike.com"),
+    "us-gov-1": ("ts01-laggar-gcw.cloudsink.net", "falcon.laggar.gcw.crowdstrike.com", "api.laggar.gcw.crowdstrike.com"),
+    "us-gov-2": ("ts01-us-gov-2.crowdstrike.mil", "falcon.us-gov-2.crowdstrike.mil", "api.us-gov-2.crowdstrike.mil"),
+})
 
 # --- Custom Exceptions ---
 
@@ -112,16 +159,51 @@ class APIError(DeploymentHelperError):
     """Raised on failures related to CrowdStrike API or registry interactions."""
     pass
 
+class RegistryAuthError(APIError):
+    """Raised when the CrowdStrike registry rejects the registry credentials."""
+    pass
+
 class ImageOperationError(DeploymentHelperError):
     """Raised on failures during Docker image operations (pull, push, tag)."""
     pass
 
 console = Console()
 
+@functools.lru_cache(maxsize=None)
+def _http_session():
+    """
+    Returns the shared HTTP session, created on first use.
 
-def print_banner() -> None:
-    """Prints the iITD banner."""
-    banner = r"""
+    The CrowdStrike API and registry calls reuse its pooled keep-alive connections.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.headers.update({"User-Agent": "iitd-falcon-helper/1", "Accept": "application/json"})
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+    ))
+    # Close the pooled connections cleanly instead of leaving them to interpreter teardown
+    atexit.register(session.close)
+    return session
+
+
+def dump_yaml(data: Any, stream: Any = None, **kwargs: Any) -> Optional[str]:
+    """yaml.dump with the libyaml-backed SafeDumper when available, keeping key order."""
+    import yaml
+    try:
+        from yaml import CSafeDumper as SafeDumper
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeDumper
+    return yaml.dump(data, stream, Dumper=SafeDumper, sort_keys=False, **kwargs)
+
+
+_BANNER = Text.from_markup(
+    r"""
 [white]  ███ [red] █████ ███████████[white] ██████████  
 [white] ░░░  [red]░░███ ░█░░░███░░░█[white]░░███░░░░███ 
 [white] ████ [red] ░███ ░   ░███  ░ [white] ░███   ░░███
@@ -131,11 +213,27 @@ def print_banner() -> None:
 [white] █████[red] █████    █████   [white] ██████████  
 [white]░░░░░ [red]░░░░░    ░░░░░    [white]░░░░░░░░░░   
     """
-    console.print(banner)
-    console.print("[bold]Copyright 2025 (c) iIT Distribution - iitd.ua[/bold]")
-    console.print("[bold]All rights reserved.[/bold]")
-    console.print()
-    console.print("CrowdStrike Cloud Security Deployment Helper")
+    "\n[bold]Copyright 2025 (c) iIT Distribution - iitd.ua[/bold]"
+    "\n[bold]All rights reserved.[/bold]"
+    "\n\nCrowdStrike Cloud Security Deployment Helper"
+)
+
+
+def _progress(transient: bool = True) -> Progress:
+    """A spinner/bar/elapsed-time progress display; it is not drawn when the console is not a terminal."""
+    return Progress(
+        SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(), TimeElapsedColumn(),
+        console=console, transient=transient, refresh_per_second=PROGRESS_REFRESH_PER_SECOND, disable=not console.is_terminal,
+    )
+
+
+def print_banner() -> None:
+    """Prints the iITD banner."""
+    console.print(_BANNER)
+
+
+# __slots__ dataclasses need Python 3.10+, the helper itself still supports 3.8
+_DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class FalconComponent(Enum):
@@ -144,17 +242,33 @@ class FalconComponent(Enum):
     IAR = "Image Assessment at Runtime"
 
 
-@dataclass
+# Choices offered on the command line and in the interactive component picker
+COMPONENT_CHOICES_LOWER = tuple(c.name.lower() for c in FalconComponent)
+COMPONENT_INDEX: Dict[str, FalconComponent] = {str(i + 1): c for i, c in enumerate(FalconComponent)}
+COMPONENT_INDEX_DISPLAY = "\n".join(f"[cyan]{i}[/cyan]: {c.value}" for i, c in COMPONENT_INDEX.items())
+_SELECTION_SEPARATOR_RE = re.compile(r"[\s,;]+")
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Command:
     component: FalconComponent
     description: str
     cmd_list: List[str]
     is_verification: bool = False
-    capture_output: bool = True
     can_fail: bool = False
+    stdin_input: Optional[str] = None
+    only_on_failure: bool = False  # diagnostic step that only runs after an earlier step failed
+    _rendered: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def rendered(self) -> str:
+        """The command line quoted for a POSIX shell, so it can be copied and run as-is."""
+        if self._rendered is None:
+            self._rendered = shlex.join(self.cmd_list)
+        return self._rendered
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ComponentConfig:
     namespace: str
     image_tag: str
@@ -169,7 +283,7 @@ class ComponentConfig:
     extra_values: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class DeploymentConfig:
     """Top-level configuration for the entire deployment."""
     cid: str
@@ -192,37 +306,12 @@ class ComponentStrategy(ABC):
     blocks in the main script logic.
     """
 
-    @property
-    @abstractmethod
-    def component_type(self) -> FalconComponent:
-        """The FalconComponent enum member this strategy represents."""
-        pass
-
-    @property
-    def release_name(self) -> str:
-        """The Helm release name for the component."""
-        return {
-            FalconComponent.SENSOR: "falcon-sensor",
-            FalconComponent.KAC: "falcon-kac",
-            FalconComponent.IAR: "falcon-imageanalyzer"
-        }[self.component_type]
-
-    @property
-    def image_name(self) -> str:
-        """The name of the docker image for the component."""
-        return self.release_name
-
-    @property
-    @abstractmethod
-    def chart_name(self) -> str:
-        """The full Helm chart name."""
-        pass
-
-    @property
-    @abstractmethod
-    def default_namespace(self) -> str:
-        """The default Kubernetes namespace for installation."""
-        pass
+    # Per-component constants, set as plain class attributes on each subclass
+    component_type: FalconComponent  # The FalconComponent enum member this strategy represents
+    release_name: str  # The Helm release name for the component
+    image_name: str  # The name of the docker image for the component
+    chart_name: str  # The full Helm chart name
+    default_namespace: str  # The default Kubernetes namespace for installation
 
     def get_image_path(self, cloud_tag: str) -> str:
         """Returns the full image path in the registry, without the registry URL."""
@@ -233,10 +322,30 @@ class ComponentStrategy(ABC):
         """Generates the Helm values dictionary for this component."""
         pass
 
+    def _image_values(self, cfg: "ComponentConfig", parent_cfg: "DeploymentConfig") -> Dict[str, Any]:
+        """Builds the `image` values block shared by all Falcon charts."""
+        image = {"repository": cfg.image_repo, "tag": cfg.image_tag, "pullPolicy": "Always"}
+        if parent_cfg.registry_token:
+            image["registryConfigJSON"] = parent_cfg.registry_token
+        return image
+
     def get_pre_install_commands(self, comp_cfg: "ComponentConfig") -> List[Command]:
         """Returns a list of commands to run before the main Helm deployment."""
         return []
 
+    def get_namespace_manifest(self, namespace: str) -> str:
+        """Returns a Namespace manifest carrying the privileged pod security labels."""
+        labels = dict(label.split("=", 1) for label in (K8S_ENFORCE_LABEL, K8S_AUDIT_LABEL, K8S_WARN_LABEL))
+        manifest = {"apiVersion": "v1", "kind": "Namespace", "metadata": {"name": namespace, "labels": labels}}
+        return dump_yaml(manifest)
+
+    def _labeled_namespace_commands(self, namespace: str) -> List[Command]:
+        """Creates (or updates) the namespace with the pod security labels the privileged workloads need."""
+        return [
+            Command(self.component_type, "Create and label namespace", ["kubectl", "apply", "-f", "-"],
+                    stdin_input=self.get_namespace_manifest(namespace)),
+        ]
+
     def get_helm_command(self, comp_cfg: "ComponentConfig", out_path: Path) -> Command:
         """Returns the main Helm upgrade/install command."""
         helm_cmd_list = [
@@ -244,123 +353,92 @@ class ComponentStrategy(ABC):
             self.chart_name,
             "-n", comp_cfg.namespace,
             "--create-namespace",
-            "-f", str(out_path)
+            "-f", str(out_path),
+            # Helm waits for the workload to become ready itself, so no separate rollout check is needed
+            "--wait", f"--timeout={KUBE_ROLLOUT_TIMEOUT}",
         ]
-        return Command(self.component_type, f"Deploy {self.component_type.value} with Helm", helm_cmd_list, capture_output=False)
+        return Command(self.component_type, f"Deploy {self.component_type.value} with Helm", helm_cmd_list)
 
     def get_verification_commands(self, comp_cfg: "ComponentConfig") -> List[Command]:
-        """Returns a list of commands to verify the installation."""
-        commands = []
-        workload_type = self.get_workload_type(comp_cfg)
-        if workload_type:
-            commands.append(Command(
-                self.component_type,
-                f"Wait for {workload_type} to be ready",
-                ["kubectl", "rollout", "status", f"{workload_type}/{self.release_name}", "-n", comp_cfg.namespace, f"--timeout={KUBE_ROLLOUT_TIMEOUT}"],
-                is_verification=True,
-                capture_output=False
-            ))
-        commands.append(Command(
+        """Returns diagnostic commands to run when the deployment fails."""
+        return [Command(
             self.component_type,
             "Check container logs",
             ["kubectl", "logs", f"-n={comp_cfg.namespace}", "-l", f"app.kubernetes.io/name={self.release_name}", f"--tail={KUBE_LOGS_TAIL_LINES}"],
-            is_verification=True
-        ))
-        return commands
-
-    def get_workload_type(self, comp_cfg: "ComponentConfig") -> Optional[str]:
-        """The primary Kubernetes workload type (e.g., 'daemonset', 'deployment')."""
-        return None
+            is_verification=True,
+            only_on_failure=True,
+        )]
 
     def get_installed_image_tag(self, release_name: str, namespace: str) -> Optional[str]:
         """Gets the installed image tag from a Helm release."""
         try:
             cp = run(["helm", "get", "values", release_name, "-n", namespace, "-o", "json"], capture=True)
-            values = json.loads(cp.stdout)
+            # A release installed without user values reports `null`
+            values = json.loads(cp.stdout) or {}
             # Default path for KAC and IAR
             return values.get("image", {}).get("tag")
-        except Exception:
+        except (subprocess.CalledProcessError, ValueError, AttributeError):
             return None
 
 
 class SensorStrategy(ComponentStrategy):
     """Deployment strategy for the Falcon Sensor component."""
-    @property
-    def component_type(self) -> FalconComponent: return FalconComponent.SENSOR
-    @property
-    def chart_name(self) -> str: return f"crowdstrike/{self.release_name}"
-    @property
-    def default_namespace(self) -> str: return "falcon-system"
-    def get_workload_type(self, comp_cfg: "ComponentConfig") -> str: return "daemonset"
+    component_type = FalconComponent.SENSOR
+    release_name = image_name = "falcon-sensor"
+    chart_name = "crowdstrike/falcon-sensor"
+    default_namespace = "falcon-system"
 
     def to_values_dict(self, cfg: "ComponentConfig", parent_cfg: "DeploymentConfig", no_sensitive: bool) -> Dict[str, Any]:
         values = {
             "falcon": {"cid": parent_cfg.cid},
             "node": {
                 "enabled": True,
-                "image": {"repository": cfg.image_repo, "tag": cfg.image_tag, "pullPolicy": "Always"},
+                "image": self._image_values(cfg, parent_cfg),
                 "backend": cfg.backend,
             },
         }
-        if parent_cfg.registry_token:
-            values["node"]["image"]["registryConfigJSON"] = parent_cfg.registry_token
         values.update(cfg.extra_values)
         return values
 
     def get_pre_install_commands(self, comp_cfg: "ComponentConfig") -> List[Command]:
-        return [
-            Command(self.component_type, "Create namespace", ["kubectl", "create", "namespace", comp_cfg.namespace], capture_output=False, can_fail=True),
-            Command(self.component_type, "Label namespace (enforce)", ["kubectl", "label", "ns", "--overwrite", comp_cfg.namespace, K8S_ENFORCE_LABEL], capture_output=False),
-            Command(self.component_type, "Label namespace (audit)", ["kubectl", "label", "ns", "--overwrite", comp_cfg.namespace, K8S_AUDIT_LABEL], capture_output=False),
-            Command(self.component_type, "Label namespace (warn)", ["kubectl", "label", "ns", "--overwrite", comp_cfg.namespace, K8S_WARN_LABEL], capture_output=False),
-        ]
+        return self._labeled_namespace_commands(comp_cfg.namespace)
 
     def get_installed_image_tag(self, release_name: str, namespace: str) -> Optional[str]:
         try:
             cp = run(["helm", "get", "values", release_name, "-n", namespace, "-o", "json"], capture=True)
-            values = json.loads(cp.stdout)
+            values = json.loads(cp.stdout) or {}
             return values.get("node", {}).get("image", {}).get("tag")
-        except Exception:
+        except (subprocess.CalledProcessError, ValueError, AttributeError):
             return None
 
 
 class KACStrategy(ComponentStrategy):
     """Deployment strategy for the Kubernetes Admission Controller (KAC) component."""
-    @property
-    def component_type(self) -> FalconComponent: return FalconComponent.KAC
-    @property
-    def chart_name(self) -> str: return f"crowdstrike/{self.release_name}"
-    @property
-    def default_namespace(self) -> str: return "falcon-kac"
-    def get_workload_type(self, comp_cfg: "ComponentConfig") -> str: return "deployment"
+    component_type = FalconComponent.KAC
+    release_name = image_name = "falcon-kac"
+    chart_name = "crowdstrike/falcon-kac"
+    default_namespace = "falcon-kac"
 
     def to_values_dict(self, cfg: "ComponentConfig", parent_cfg: "DeploymentConfig", no_sensitive: bool) -> Dict[str, Any]:
         values = {
             "falcon": {"cid": parent_cfg.cid},
-            "image": {"repository": cfg.image_repo, "tag": cfg.image_tag, "pullPolicy": "Always"},
+            "image": self._image_values(cfg, parent_cfg),
             "clusterName": cfg.cluster_name,
         }
-        if parent_cfg.registry_token:
-            values["image"]["registryConfigJSON"] = parent_cfg.registry_token
         values.update(cfg.extra_values)
         return values
 
 
 class IARStrategy(ComponentStrategy):
     """Deployment strategy for the Image Assessment at Runtime (IAR) component."""
-    @property
-    def component_type(self) -> FalconComponent: return FalconComponent.IAR
-    @property
-    def chart_name(self) -> str: return "crowdstrike/falcon-image-analyzer"
-    @property
-    def default_namespace(self) -> str: return "falcon-imageanalyzer"
-
-    def get_workload_type(self, comp_cfg: "ComponentConfig") -> str:
-        return "daemonset" if comp_cfg.iar_mode == 'socket' else 'deployment'
+    component_type = FalconComponent.IAR
+    release_name = image_name = "falcon-imageanalyzer"
+    chart_name = "crowdstrike/falcon-image-analyzer"
+    default_namespace = "falcon-imageanalyzer"
 
     def to_values_dict(self, cfg: "ComponentConfig", parent_cfg: "DeploymentConfig", no_sensitive: bool) -> Dict[str, Any]:
         values = {
-            "image": {"repository": cfg.image_repo, "tag": cfg.image_tag, "pullPolicy": "Always"},
+            "image": self._image_values(cfg, parent_cfg),
             "crowdstrikeConfig": {
                 "cid": parent_cfg.cid,
                 "clientID": parent_cfg.client_id,
@@ -377,18 +455,11 @@ class IARStrategy(ComponentStrategy):
             values["deployment"] = {"enabled": False}
             values["daemonset"] = {"enabled": True}
             values["crowdstrikeConfig"]["agentRuntime"] = cfg.iar_runtime
-        if parent_cfg.registry_token:
-            values["image"]["registryConfigJSON"] = parent_cfg.registry_token
         values.update(cfg.extra_values)
         return values
 
     def get_pre_install_commands(self, comp_cfg: "ComponentConfig") -> List[Command]:
-        return [
-            Command(self.component_type, "Create namespace", ["kubectl", "create", "namespace", comp_cfg.namespace], capture_output=False, can_fail=True),
-            Command(self.component_type, "Label namespace (enforce)", ["kubectl", "label", "ns", "--overwrite", comp_cfg.namespace, K8S_ENFORCE_LABEL], capture_output=False),
-            Command(self.component_type, "Label namespace (audit)", ["kubectl", "label", "ns", "--overwrite", comp_cfg.namespace, K8S_AUDIT_LABEL], capture_output=False),
-            Command(self.component_type, "Label namespace (warn)", ["kubectl", "label", "ns", "--overwrite", comp_cfg.namespace, K8S_WARN_LABEL], capture_output=False),
-        ]
+        return self._labeled_namespace_commands(comp_cfg.namespace)
 
 
 COMPONENT_STRATEGIES: Dict[FalconComponent, ComponentStrategy] = {
@@ -398,43 +469,116 @@ COMPONENT_STRATEGIES: Dict[FalconComponent, ComponentStrategy] = {
 }
 
 
+@functools.lru_cache(maxsize=8192)
 def version_to_tuple(v: str) -> tuple[int, ...]:
-    """Converts a version string to a tuple of integers for comparison."""
-    try:
-        return tuple(map(int, v.split('-')[0].split('.')))
-    except (ValueError, AttributeError):
-        return (0,)
+    """
+    Converts a version string to a tuple of integers for comparison.
+
+    The leading run of numbers separated by '.' or '-' is used, so the build number of an image tag
+    counts too: `7.26.0-17905-1.falcon-linux.Release.EU-1` becomes (7, 26, 0, 17905, 1).
+    Keys of different lengths compare by prefix, so use `is_version_deployed` to compare a target
+    tag with an installed one.
+    """
+    m = _VERSION_KEY_RE.match(v) if isinstance(v, str) else None
+    return tuple(map(int, _DIGITS_RE.findall(m.group(1)))) if m else (0,)
+
+
+def is_version_deployed(target: str, installed: str) -> bool:
+    """
+    Returns True if `installed` is the same release as `target` or a newer one.
+
+    Only the components both versions have are compared, so a short tag such as `7.26.0` and a
+    full build tag such as `7.26.0-17905-1` of the same release match in either direction.
+    """
+    target_key, installed_key = version_to_tuple(target), version_to_tuple(installed)
+    length = min(len(target_key), len(installed_key))
+    return target_key[:length] <= installed_key[:length]
+
 
+@functools.lru_cache(maxsize=None)
+def _which(name: str) -> Optional[str]:
+    """shutil.which, resolved once per binary name for the life of the process."""
+    return shutil.which(name)
 
-def run(cmd: list[str] | str, capture: bool = True, stdin_input: Optional[str] = None) -> subprocess.CompletedProcess:
+
+# Our children need none of our other descriptors. Without close_fds, and given the binary's full
+# path (CPython only takes this route when `executable` has a directory part), they are launched
+# through posix_spawn instead of fork + exec.
+_SPAWN_OPTIONS: Dict[str, Any] = {} if sys.platform == "win32" else {"close_fds": False}
+
+
+def _spawn_options(cmd: List[str]) -> Dict[str, Any]:
+    """Returns the cheap spawn options for `cmd`, including its binary's resolved path when it is in PATH."""
+    path = _which(cmd[0])
+    return {**_SPAWN_OPTIONS, "executable": path} if path else _SPAWN_OPTIONS
+
+
+def _spawn(cmd: List[str], **kwargs) -> subprocess.Popen:
+    """Starts a child process with the cheap spawn options."""
+    return subprocess.Popen(cmd, **_spawn_options(cmd), **kwargs)
+
+
+def run(cmd: list[str] | str, capture: bool = True, stdin_input: Optional[str] = None, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
     """Executes a shell command and returns the completed process."""
     if isinstance(cmd, str):
         cmd = cmd.split()
-    return subprocess.run(cmd, check=True, text=True, capture_output=capture, input=stdin_input)
+    return subprocess.run(cmd, check=True, text=True, capture_output=capture, input=stdin_input, timeout=timeout, **_spawn_options(cmd))
+
+
+def _probe_binary_version(name: str) -> Optional[str]:
+    """
+    Runs a binary to ask for its x.y.z client version; returns None if it cannot be determined.
+
+    helm and kubectl are asked for their short/JSON client version, which needs no cluster access;
+    anything else, or an older client that rejects those flags, falls back to `<name> version`.
+    Each probe is bounded by VERSION_PROBE_TIMEOUT_S, so a hung wrapper script cannot stall startup.
+    """
+    try:
+        if name == "kubectl":
+            output = json.loads(run(["kubectl", "version", "--client", "-o", "json"], timeout=VERSION_PROBE_TIMEOUT_S).stdout)["clientVersion"]["gitVersion"]
+        elif name == "helm":
+            output = run(["helm", "version", "--short"], timeout=VERSION_PROBE_TIMEOUT_S).stdout
+        else:
+            raise LookupError(name)
+    except subprocess.TimeoutExpired:
+        return None
+    except (subprocess.CalledProcessError, OSError, ValueError, LookupError):
+        try:
+            output = subprocess.run(
+                [name, "version"], check=True, text=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                timeout=VERSION_PROBE_TIMEOUT_S, **_spawn_options([name]),
+            ).stdout
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
+            return None
+    m = _VERSION_RE.search(output)
+    return m.group(1) if m else None
+
+
+@functools.lru_cache(maxsize=None)
+def get_binary_version(name: str) -> Optional[str]:
+    """Returns the x.y.z client version of a binary in PATH, or None if it cannot be determined. Probed once per run."""
+    return _probe_binary_version(name)
 
 
 def check_binary(name: str, min_version: str | None = None) -> None:
     """
     Checks if a binary exists in PATH and meets an optional minimum version.
-    
+
     Raises:
         PrerequisiteError: If the binary is not found or version is too low.
     """
-    if shutil.which(name) is None:
+    if _which(name) is None:
         console.print(f"\n[red bold]❌ {name} not found in PATH.[/red bold]")
         raise PrerequisiteError(f"{name} not found in PATH.")
-    
+
     if min_version:
-        try:
-            cp = run([name, "version"], capture=True)
-            output = cp.stdout + cp.stderr
-            import re
-            m = re.search(r"(\d+\.\d+\.\d+)", output)
-            if m and tuple(map(int, m.group(1).split("."))) < tuple(map(int, min_version.split("."))):
-                console.print(f"\n[red bold]❌ {name} {m.group(1)} detected, but ≥{min_version} required.[/red bold]")
-                raise PrerequisiteError(f"Incorrect {name} version. Found {m.group(1)}, require >= {min_version}")
-        except Exception:
+        version = get_binary_version(name)
+        if version is None:
             console.print(f"\n[yellow]⚠️  Unable to verify {name} version – continuing.[/yellow]")
+            return
+        if version_to_tuple(version) < version_to_tuple(min_version):
+            console.print(f"\n[red bold]❌ {name} {version} detected, but ≥{min_version} required.[/red bold]")
+            raise PrerequisiteError(f"Incorrect {name} version. Found {version}, require >= {min_version}")
 
 
 def check_cluster() -> None:
@@ -445,16 +589,68 @@ def check_cluster() -> None:
         ClusterConnectionError: If `kubectl` commands fail.
     """
     try:
-        run(["kubectl", "version", "--client"], capture=True)
-        run(["kubectl", "get", "nodes"], capture=True)
+        run(["kubectl", "get", "nodes", "-o", "name", f"--request-timeout={KUBE_REQUEST_TIMEOUT}"], capture=True)
     except subprocess.CalledProcessError as exc:
         console.print(f"\n{Panel(str(exc), title='kubectl output')}")
         raise ClusterConnectionError("Unable to reach the cluster. Check KUBECONFIG.")
 
 
-def get_network_requirements() -> Dict[str, list[str]]:
-    """Returns the dictionary of network requirements by region."""
-    return NETWORK_REQUIREMENTS
+async def _probe_host(hostname: str) -> tuple[str, Optional[str]]:
+    """
+    Opens a TCP connection to a host; returns the host and an error message, or None on success.
+
+    Name resolution and the connect each get their own timeout, so a slow resolver is reported
+    as such instead of eating into the connect budget. The host is resolved once and its addresses
+    are tried in order within the connect budget, so an unreachable IPv6 address falls back to IPv4.
+    """
+    loop = asyncio.get_running_loop()
+    writer = None
+    try:
+        try:
+            addrinfo = await asyncio.wait_for(
+                loop.getaddrinfo(hostname, NETWORK_CONNECTIVITY_PORT, type=socket.SOCK_STREAM),
+                NETWORK_CONNECTIVITY_TIMEOUT_S,
+            )
+        except asyncio.TimeoutError:
+            return hostname, "DNS lookup timed out"
+        deadline = loop.time() + NETWORK_CONNECTIVITY_TIMEOUT_S
+        for index, (family, _, _, _, sockaddr) in enumerate(addrinfo):
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(sockaddr[0], sockaddr[1], family=family), max(deadline - loop.time(), 0)
+                )
+                return hostname, None
+            except (asyncio.TimeoutError, OSError):
+                # Report the last address's error once every address has failed
+                if index == len(addrinfo) - 1 or loop.time() >= deadline:
+                    raise
+        return hostname, "DNS lookup returned no addresses"
+    except asyncio.TimeoutError:
+        return hostname, "connection timed out"
+    except socket.gaierror as e:
+        return hostname, f"DNS lookup failed ({e.strerror or e})"
+    except ConnectionRefusedError:
+        return hostname, f"connection refused on port {NETWORK_CONNECTIVITY_PORT}"
+    except OSError as e:
+        return hostname, e.strerror or str(e)
+    finally:
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+async def _probe_hosts(hosts: tuple[str, ...], progress: Progress, task) -> List[tuple[str, str]]:
+    """Probes all hosts concurrently, advancing the progress task as each one finishes."""
+    failed_hosts = []
+    for probe in asyncio.as_completed([_probe_host(hostname) for hostname in hosts]):
+        hostname, error = await probe
+        if error is not None:
+            failed_hosts.append((hostname, error))
+        progress.advance(task)
+    return failed_hosts
 
 
 def check_network_connectivity(region: str) -> bool:
@@ -464,35 +660,15 @@ def check_network_connectivity(region: str) -> bool:
     Returns:
         bool: True if all hosts are reachable, False otherwise.
     """
-    import socket
-    import concurrent.futures
-    
-    network_reqs = get_network_requirements()
-    if region not in network_reqs:
+    hosts = NETWORK_REQUIREMENTS.get(region)
+    if hosts is None:
         console.print(f"[red]❌ Unknown region: {region}[/red]")
         return False
-    
-    def check_host(hostname: str, port: int = NETWORK_CONNECTIVITY_PORT, timeout: int = NETWORK_CONNECTIVITY_TIMEOUT_S) -> tuple[str, bool, str]:
-        try:
-            sock = socket.create_connection((hostname, port), timeout)
-            sock.close()
-            return hostname, True, "OK"
-        except (socket.gaierror, socket.timeout, Exception) as e:
-            return hostname, False, str(e)
-    
-    hosts = network_reqs[region]
-    failed_hosts = []
-    
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(), TimeElapsedColumn(), console=console, transient=True) as progress:
+
+    with _progress() as progress:
         task = progress.add_task(f"Checking network connectivity for {region.upper()}", total=len(hosts))
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            futures = {executor.submit(check_host, host): host for host in hosts}
-            for future in concurrent.futures.as_completed(futures):
-                hostname, success, message = future.result()
-                if not success:
-                    failed_hosts.append((hostname, message))
-                progress.advance(task)
-    
+        failed_hosts = asyncio.run(_probe_hosts(hosts, progress, task))
+
     if failed_hosts:
         console.print(f"[red]❌ Network connectivity issues detected for {region.upper()}:[/red]")
         for hostname, error in failed_hosts:
@@ -506,8 +682,13 @@ def check_network_connectivity(region: str) -> bool:
 def setup_helm_repo() -> None:
     """Adds and updates the CrowdStrike Helm repository."""
     try:
-        run(["helm", "repo", "add", HELM_REPO_NAME, HELM_REPO_URL], capture=True)
-        run(["helm", "repo", "update"], capture=True)
+        try:
+            # Re-adding fetches just this repo's index; `helm repo update` would refresh every configured repo
+            run(["helm", "repo", "add", "--force-update", HELM_REPO_NAME, HELM_REPO_URL], capture=True)
+        except subprocess.CalledProcessError:
+            # Helm releases before 3.3 have no --force-update
+            run(["helm", "repo", "add", HELM_REPO_NAME, HELM_REPO_URL], capture=True)
+            run(["helm", "repo", "update"], capture=True)
         console.print("[green]✅ CrowdStrike Helm repository added successfully[/green]")
     except subprocess.CalledProcessError as exc:
         console.print(f"[yellow]⚠️  Helm repo setup failed (might already exist): {exc}[/yellow]")
@@ -517,20 +698,28 @@ def get_cloud_api_config(cloud_region: str) -> tuple[str, str, str]:
     """
     Retrieves the API base URL, cloud tag, and registry URL for a given region.
     """
-    return CLOUD_API_CONFIGS.get(cloud_region, CLOUD_API_CONFIGS[DEFAULT_CLOUD_REGION])
+    try:
+        return CLOUD_API_CONFIGS[cloud_region]
+    except KeyError:
+        return CLOUD_API_CONFIGS[DEFAULT_CLOUD_REGION]
 
 
-def get_oauth_token(client_id: str, client_secret: str, api_base: str) -> str:
+def get_oauth_token(client_id: str, client_secret: str, api_base: str) -> tuple[str, int]:
     """
     Obtains an OAuth2 token from the CrowdStrike API.
-    
+
+    Returns:
+        The access token and its lifetime in seconds (0 if the API did not say).
+
     Raises:
         APIError: If the request to the token endpoint fails.
     """
+    import requests
     try:
-        response = requests.post(f"https://{api_base}/oauth2/token", data={"client_id": client_id, "client_secret": client_secret})
+        response = _http_session().post(f"https://{api_base}/oauth2/token", data={"client_id": client_id, "client_secret": client_secret}, timeout=API_TIMEOUT)
         response.raise_for_status()
-        return response.json()["access_token"]
+        body = response.json()
+        return body["access_token"], int(body.get("expires_in") or 0)
     except requests.RequestException as e:
         raise APIError(f"Failed to get OAuth token: {e}")
 
@@ -542,10 +731,11 @@ def get_registry_credentials(oauth_token: str, api_base: str, cid: str) -> tuple
     Raises:
         APIError: If the request fails or the response is malformed.
     """
+    import requests
     try:
         cid_first_part = cid.split('-')[0].lower()
         username = f"fc-{cid_first_part}"
-        response = requests.get(f"https://{api_base}/container-security/entities/image-registry-credentials/v1", headers={"Authorization": f"Bearer {oauth_token}"})
+        response = _http_session().get(f"https://{api_base}/container-security/entities/image-registry-credentials/v1", headers={"Authorization": f"Bearer {oauth_token}"}, timeout=API_TIMEOUT)
         response.raise_for_status()
         data = response.json()
         if not data.get("resources"):
@@ -558,100 +748,426 @@ def get_registry_credentials(oauth_token: str, api_base: str, cid: str) -> tuple
         raise APIError(f"Could not parse registry credentials from API response: {e}")
 
 
-def get_latest_image_tag(component: FalconComponent, cs_registry: str, cloud_tag: str, cs_username: str, cs_password: str) -> Optional[str]:
+def _credentials_cache_key(client_id: str, client_secret: str, api_base: str, cid: str) -> str:
+    # Changing any of the inputs, including the secret, must miss the cache
+    return hashlib.sha256("\0".join((client_id, client_secret, api_base, cid)).encode()).hexdigest()
+
+
+def _load_cached_registry_credentials(key: str) -> Optional[tuple[str, str]]:
+    """Returns registry credentials saved by an earlier run for `key`, unless they are about to expire."""
+    try:
+        entry = json.loads(CREDENTIALS_CACHE_FILE.read_bytes())
+        if entry["key"] == key and entry["expires_at"] - TOKEN_EXPIRY_MARGIN_S > time.time():
+            return entry["username"], entry["password"]
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+    return None
+
+
+def get_registry_login(client_id: str, client_secret: str, api_base: str, cid: str, use_cache: bool = True, refresh: bool = False) -> tuple[str, str, bool]:
+    """
+    Returns the CrowdStrike registry username and password, authenticating with the API if needed,
+    and whether they came from the cache.
+
+    With `use_cache`, the credentials are kept in a private file under CACHE_DIR for as long as the
+    OAuth token they were fetched with is valid, so reruns within that window skip both API calls.
+    `refresh` ignores the cached credentials, e.g. after the registry has rejected them.
+
+    Raises:
+        APIError: If authentication or the credentials request fails.
+    """
+    key = _credentials_cache_key(client_id, client_secret, api_base, cid)
+    if use_cache and not refresh:
+        cached = _load_cached_registry_credentials(key)
+        if cached:
+            return cached[0], cached[1], True
+
+    oauth_token, expires_in = get_oauth_token(client_id, client_secret, api_base)
+    username, password = get_registry_credentials(oauth_token, api_base, cid)
+    if use_cache and expires_in > TOKEN_EXPIRY_MARGIN_S:
+        entry = {"key": key, "expires_at": time.time() + expires_in, "username": username, "password": password}
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            _write_private_file(CREDENTIALS_CACHE_FILE, json.dumps(entry).encode())
+        except OSError:
+            pass
+    return username, password, False
+
+
+def _cache_path(key: str) -> Path:
+    return CACHE_DIR / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+
+def _read_cache_entry(key: str) -> Optional[Dict[str, Any]]:
+    """Returns the entry stored under `key` (such as a URL) by an earlier run, or None."""
+    try:
+        entry = json.loads(_cache_path(key).read_bytes())
+    except (OSError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def _write_cache_entry(key: str, entry: Dict[str, Any]) -> None:
+    """Stores an entry under `key`; the cache is best-effort, so failures are ignored."""
+    path = _cache_path(key)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _write_private_file(path, json.dumps(entry).encode())
+    except OSError:
+        pass
+
+
+def get_latest_image_tag(component: FalconComponent, cs_registry: str, cloud_tag: str, cs_username: str, cs_password: str, refresh: bool = False) -> Optional[str]:
     """
     Finds the latest versioned image tag for a component from the CS registry.
+    The tag list is kept in CACHE_DIR across runs: for TAG_CACHE_TTL_S it is used as-is, after that
+    it is revalidated with its ETag so an unchanged list is not downloaded again. `refresh` ignores the cache.
     
     Raises:
+        RegistryAuthError: If the registry rejects the credentials.
         APIError: If the request to the registry fails.
     """
+    import requests
     strategy = COMPONENT_STRATEGIES[component]
     image_path = strategy.get_image_path(cloud_tag)
     tags_url = f"https://{cs_registry}/v2/{image_path}/tags/list"
     console.print(f"🔍 Querying for latest {component.value} version...")
+    cached = None if refresh else _read_cache_entry(tags_url)
+    if cached and not isinstance(cached.get("tags"), list):
+        cached = None
     try:
-        tag_response = requests.get(tags_url, auth=(cs_username, cs_password), timeout=API_REQUEST_TIMEOUT_S)
-        tag_response.raise_for_status()
-        tags_data = tag_response.json()
-        tags = tags_data.get("tags", [])
-        versioned_tags = sorted([t for t in tags if t != LATEST_IMAGE_TAG_KEYWORD and t[0].isdigit()], key=version_to_tuple, reverse=True)
-        return versioned_tags[0] if versioned_tags else None
+        if cached and time.time() - cached.get("fetched_at", 0) < TAG_CACHE_TTL_S:
+            tags = cached["tags"]
+        else:
+            headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else None
+            tag_response = _http_session().get(tags_url, auth=(cs_username, cs_password), headers=headers, timeout=API_TIMEOUT)
+            if headers and tag_response.status_code == 304:
+                tags, etag = cached["tags"], cached["etag"]
+            elif tag_response.status_code == 401:
+                raise RegistryAuthError(f"The CrowdStrike registry {cs_registry} rejected the registry credentials.")
+            else:
+                tag_response.raise_for_status()
+                tags = tag_response.json().get("tags") or []
+                etag = tag_response.headers.get("ETag")
+            _write_cache_entry(tags_url, {"etag": etag, "fetched_at": time.time(), "tags": tags})
+        return max(
+            (t for t in tags if t != LATEST_IMAGE_TAG_KEYWORD and t and t[0].isdigit()),
+            key=version_to_tuple,
+            default=None,
+        )
     except requests.RequestException as e:
         raise APIError(f"Failed to fetch image tags from {cs_registry}: {e}")
     except (KeyError, IndexError):
         return None
 
 
+def check_registry_credentials(cs_registry: str, image_path: str, cs_username: str, cs_password: str) -> None:
+    """
+    Makes one small authenticated request to the CS registry to confirm it accepts the credentials.
+
+    Other failures are ignored here; the tag lookups and image copies report them with more context.
+
+    Raises:
+        RegistryAuthError: If the registry rejects the credentials.
+    """
+    import requests
+    try:
+        response = _http_session().get(f"https://{cs_registry}/v2/{image_path}/tags/list", params={"n": 1}, auth=(cs_username, cs_password), timeout=API_TIMEOUT)
+    except requests.RequestException:
+        return
+    if response.status_code == 401:
+        raise RegistryAuthError(f"The CrowdStrike registry {cs_registry} rejected the registry credentials.")
+
+
+def fetch_latest_tags(components: List[FalconComponent], cs_registry: str, cloud_tag: str, cs_username: str, cs_password: str, refresh: bool = False) -> Dict[FalconComponent, Optional[str]]:
+    """
+    Resolves the latest image tag for several components concurrently.
+
+    Raises:
+        RegistryAuthError: If the registry rejects the credentials.
+        APIError: If any of the registry requests fails.
+    """
+    if not components:
+        return {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(components)) as executor:
+        futures = {
+            executor.submit(get_latest_image_tag, component, cs_registry, cloud_tag, cs_username, cs_password, refresh): component
+            for component in components
+        }
+        return {futures[future]: future.result() for future in concurrent.futures.as_completed(futures)}
+
+
+@functools.lru_cache(maxsize=None)
+def _helm_release_index() -> Optional[Dict[tuple[str, str], Dict[str, Any]]]:
+    """
+    Lists the Falcon Helm releases in all namespaces once, keyed by (name, namespace).
+
+    Returns None if the releases cannot be listed, e.g. when RBAC only grants access to the
+    Falcon namespaces. Call _helm_release_index.cache_clear() after anything that installs or
+    removes releases.
+    """
+    release_filter = "^(" + "|".join(strategy.release_name for strategy in COMPONENT_STRATEGIES.values()) + ")$"
+    try:
+        # --max 0 lifts helm's default limit of 256 releases
+        result = run(["helm", "list", "-A", "--all", "--max", "0", "--filter", release_filter, "-o", "json"], capture=True)
+        return {(release["name"], release["namespace"]): release for release in json.loads(result.stdout or "[]")}
+    except (subprocess.CalledProcessError, ValueError, TypeError, KeyError):
+        return None
+
+
 def check_helm_release_exists(release_name: str, namespace: str) -> bool:
     """Checks if a Helm release is currently deployed in a namespace."""
+    index = _helm_release_index()
+    if index is not None:
+        return (release_name, namespace) in index
+    # Listing across namespaces failed, so ask about this release in its own namespace
     try:
-        subprocess.run(["helm", "status", release_name, "-n", namespace], check=True, stdout=DEVNULL, stderr=DEVNULL)
+        status_cmd = ["helm", "status", release_name, "-n", namespace]
+        subprocess.run(status_cmd, check=True, stdout=DEVNULL, stderr=DEVNULL, **_spawn_options(status_cmd))
         return True
     except subprocess.CalledProcessError:
         return False
 
 
+@functools.lru_cache(maxsize=None)
 def get_installed_image_tag(release_name: str, namespace: str, component: FalconComponent) -> Optional[str]:
     strategy = COMPONENT_STRATEGIES[component]
     return strategy.get_installed_image_tag(release_name, namespace)
 
 
-def download_and_push_image(component: FalconComponent, cfg: DeploymentConfig, component_cfg: ComponentConfig) -> tuple[str, str]:
+def is_pinned_version_deployed(component: FalconComponent, comp_cfg: "ComponentConfig") -> bool:
+    """Returns True if the component is pinned to a specific tag and its release already runs that version or newer."""
+    if comp_cfg.image_tag == LATEST_IMAGE_TAG_KEYWORD:
+        return False
+    release_name = COMPONENT_STRATEGIES[component].release_name
+    if not check_helm_release_exists(release_name, comp_cfg.namespace):
+        return False
+    installed_tag = get_installed_image_tag(release_name, comp_cfg.namespace, component)
+    return installed_tag is not None and is_version_deployed(comp_cfg.image_tag, installed_tag)
+
+
+def is_local_registry(registry: str) -> bool:
+    """Returns True for loopback registries, which Docker talks to over plain HTTP."""
+    host = registry.split("/", 1)[0].rsplit(":", 1)[0]
+    return host == "localhost" or host.startswith("127.")
+
+
+def _head_manifest(image: str, tag: str, credentials: Optional[tuple[str, str]] = None) -> Optional[Dict[str, str]]:
+    """
+    Returns the response headers of a manifest HEAD request for `image:tag`, or None if the registry does not serve it.
+
+    `image` is a full reference without tag, e.g. `localhost:5000/falcon-sensor`. Errors and
+    authentication challenges count as "not present", so callers fall back to copying.
+    """
+    import requests
+    registry, _, repository = image.partition("/")
+    scheme = "http" if is_local_registry(registry) else "https"
+    try:
+        response = _http_session().head(f"{scheme}://{registry}/v2/{repository}/manifests/{tag}", auth=credentials, headers={"Accept": MANIFEST_ACCEPT}, timeout=API_TIMEOUT)
+    except requests.RequestException:
+        return None
+    if response.status_code != 200 or "Docker-Content-Digest" not in response.headers:
+        return None
+    return response.headers
+
+
+def _image_manifest_digest(headers: Optional[Dict[str, str]]) -> Optional[str]:
     """
-    Pulls an image from the CrowdStrike registry, tags it, and pushes to a local registry.
+    Returns the digest from `_head_manifest` headers, or None if it is unknown.
+
+    Manifest lists and OCI indexes also give None: copying one platform out of them produces a
+    manifest with a different digest, so the two cannot be compared.
+    """
+    if headers is None or headers.get("Content-Type", "").split(";")[0].strip() in MANIFEST_INDEX_TYPES:
+        return None
+    return headers["Docker-Content-Digest"]
+
+
+def stream_image_command(cmd: List[str], progress: Progress, task: TaskID, label: str) -> None:
+    """
+    Runs an image command, showing its latest output line as the progress task's description.
+
+    Only the last few lines are kept, to explain a failure, so memory stays flat however much the tool prints.
+
+    Raises:
+        subprocess.CalledProcessError: If the command fails; `stderr` holds the tail of its output.
+    """
+    tail: Deque[str] = deque(maxlen=IMAGE_OUTPUT_TAIL_LINES)
+    with _spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace") as process:
+        for line in process.stdout:
+            line = line.strip()
+            if line:
+                tail.append(line)
+                progress.update(task, description=f"{label}: {escape(line[:80])}")
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, cmd, stderr="\n".join(tail))
+
+
+def copy_image_with_skopeo(src_image: str, dst_image: str, src_credentials: tuple[str, str], dst_registry: str, progress: Progress, task: TaskID) -> None:
+    """
+    Copies an image registry-to-registry with skopeo, without storing it in a local Docker daemon.
+
+    Source credentials are passed through a private temporary auth file rather than on the command line.
+    skopeo's output is streamed into `task`.
+
+    Raises:
+        subprocess.CalledProcessError: If skopeo fails.
+    """
+    src_registry = src_image.split("/", 1)[0]
+    username, password = src_credentials
+    auth = base64.b64encode(f"{username}:{password}".encode()).decode()
+    with tempfile.NamedTemporaryFile("w", suffix=".json") as authfile:
+        json.dump({"auths": {src_registry: {"auth": auth}}}, authfile)
+        authfile.flush()
+        cmd = ["skopeo", "copy", "--src-authfile", authfile.name]
+        if is_local_registry(dst_registry):
+            cmd.append("--dest-tls-verify=false")
+        cmd += [f"docker://{src_image}", f"docker://{dst_image}"]
+        stream_image_command(cmd, progress, task, f"Copying {dst_image}")
+
+
+def copy_image_with_crane(src_image: str, dst_image: str, dst_registry: str, progress: Progress, task: TaskID) -> None:
+    """
+    Copies an image registry-to-registry with crane, without storing it in a local Docker daemon.
+
+    crane reads credentials from the Docker config, so the registry must already be logged in with `docker login`.
+    crane's output is streamed into `task`.
+
+    Raises:
+        subprocess.CalledProcessError: If crane fails.
+    """
+    cmd = ["crane", "copy"]
+    if is_local_registry(dst_registry):
+        cmd.append("--insecure")
+    cmd += [src_image, dst_image]
+    stream_image_command(cmd, progress, task, f"Copying {dst_image}")
+
+
+def download_and_push_image(component: FalconComponent, cfg: DeploymentConfig, component_cfg: ComponentConfig, progress: Progress, cs_credentials: tuple[str, str], force: bool = False) -> tuple[str, str]:
+    """
+    Copies an image from the CrowdStrike registry to a local registry.
+
+    Nothing is copied if the local registry already has the tag with the upstream digest, unless `force` is set.
+    Uses `skopeo copy` or `crane copy` when available, otherwise, or if that copy fails, pulls, tags
+    and pushes with Docker. Progress is reported as a new task on the caller's `progress` display.
 
     Raises:
-        ImageOperationError: If any docker command fails.
+        ImageOperationError: If any image command fails.
+        APIError: If Docker cannot log in to the CrowdStrike registry for the fallback.
     """
     strategy = COMPONENT_STRATEGIES[component]
     api_base, cloud_tag, cs_registry = get_cloud_api_config(cfg.cloud_region)
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(), TimeElapsedColumn(), console=console, transient=True) as progress:
+    cs_image_path = strategy.get_image_path(cloud_tag)
+    cs_image = f"{cs_registry}/{cs_image_path}"
+    full_cs_image = f"{cs_image}:{component_cfg.image_tag}"
+    local_image = f"{cfg.local_registry}/{strategy.image_name}"
+    local_full_image = f"{local_image}:{component_cfg.image_tag}"
+
+    local_manifest = None if force else _head_manifest(local_image, component_cfg.image_tag)
+    if local_manifest is not None:
+        # A tag republished upstream must be copied again; if the digests cannot be compared, trust the tag
+        upstream_digest = _image_manifest_digest(_head_manifest(cs_image, component_cfg.image_tag, cs_credentials))
+        if upstream_digest is None or upstream_digest == _image_manifest_digest(local_manifest):
+            progress.console.print(f"[green]✅ {local_full_image} is already in the local registry, skipping copy[/green]")
+            return local_image, component_cfg.image_tag
+        progress.console.print(f"[yellow]{local_full_image} differs from {full_cs_image}, copying it again[/yellow]")
+
+    copied = False
+    use_skopeo = _which("skopeo") is not None
+    if use_skopeo or _which("crane"):
+        task = progress.add_task(f"Copying {full_cs_image} to {cfg.local_registry}...", total=1)
+        try:
+            if use_skopeo:
+                copy_image_with_skopeo(full_cs_image, local_full_image, cs_credentials, cfg.local_registry, progress, task)
+            else:
+                copy_image_with_crane(full_cs_image, local_full_image, cfg.local_registry, progress, task)
+            progress.advance(task)
+            copied = True
+        except subprocess.CalledProcessError as e:
+            # Neither tool knows the Docker daemon's insecure-registries, so plain-HTTP registries may only work through Docker
+            progress.update(task, visible=False)
+            reason = (e.stderr or "").strip().splitlines()[-1:] or ["unknown error"]
+            progress.console.print(f"[yellow]⚠️  Direct copy to {cfg.local_registry} failed ({escape(reason[0][:120])}), falling back to Docker[/yellow]")
+            if use_skopeo:
+                # skopeo used its own authfile, so Docker has not logged in to the CrowdStrike registry yet
+                docker_login(cs_registry, *cs_credentials)
+
+    if not copied:
         task = progress.add_task(f"Downloading & Pushing {component.value}", total=3)
-        cs_image_path = strategy.get_image_path(cloud_tag)
-        cs_image = f"{cs_registry}/{cs_image_path}"
-        full_cs_image = f"{cs_image}:{component_cfg.image_tag}"
-        
-        progress.update(task, description=f"Pulling {full_cs_image}...")
         try:
-            run(["docker", "pull", full_cs_image], capture=True)
+            stream_image_command(["docker", "pull", full_cs_image], progress, task, f"Pulling {full_cs_image}")
         except subprocess.CalledProcessError as e:
             raise ImageOperationError(f"Failed to pull image {full_cs_image}.", e.stderr)
         progress.advance(task)
-        
-        local_image = f"{cfg.local_registry}/{strategy.image_name}"
-        local_full_image = f"{local_image}:{component_cfg.image_tag}"
-        
+
         progress.update(task, description=f"Tagging as {local_full_image}...")
         run(["docker", "tag", full_cs_image, local_full_image], capture=True)
         progress.advance(task)
 
-        progress.update(task, description=f"Pushing to {cfg.local_registry}...")
         try:
-            run(["docker", "push", local_full_image], capture=True)
+            stream_image_command(["docker", "push", local_full_image], progress, task, f"Pushing {local_full_image}")
         except subprocess.CalledProcessError as e:
             raise ImageOperationError(f"Failed to push image to local registry {cfg.local_registry}.", e.stderr)
         progress.advance(task)
-    
-    console.print(f"[green]✅ Image successfully downloaded and pushed to {local_full_image}[/green]")
+    progress.update(task, visible=False)
+
+    progress.console.print(f"[green]✅ Image successfully downloaded and pushed to {local_full_image}[/green]")
     return local_image, component_cfg.image_tag
 
 
+def docker_login(registry: str, username: str, password: str) -> None:
+    """
+    Logs Docker in to the CrowdStrike registry, passing the password on stdin.
+
+    Raises:
+        RegistryAuthError: If the registry rejects the credentials.
+        APIError: If the login fails for any other reason.
+    """
+    try:
+        run(["docker", "login", registry, "-u", username, "--password-stdin"], capture=True, stdin_input=password)
+    except subprocess.CalledProcessError as e:
+        error_class = RegistryAuthError if "unauthorized" in (e.stderr or "").lower() else APIError
+        raise error_class(f"Failed to login to CrowdStrike registry {registry}.", e.stderr)
+
+
 def generate_pull_token(local_registry: str) -> str:
     """
     Generates a base64 encoded pull token from the local docker config.
     
     Returns an empty string if no auth is found for the given registry.
     """
-    docker_config_path = Path.home() / ".docker" / "config.json"
-    if docker_config_path.exists():
-        with open(docker_config_path, 'r') as f:
-            docker_config = json.load(f)
+    if DOCKER_CONFIG_FILE.is_file():
+        docker_config = json.loads(DOCKER_CONFIG_FILE.read_bytes())
         if "auths" in docker_config and local_registry in docker_config["auths"]:
-            return base64.b64encode(json.dumps(docker_config).encode()).decode()
+            # Only embed the entry for the local registry, not every credential the user has stored
+            registry_config = {"auths": {local_registry: docker_config["auths"][local_registry]}}
+            return base64.b64encode(json.dumps(registry_config, separators=(",", ":")).encode()).decode()
     console.print(f"[yellow]⚠️ No authentication found for local registry {local_registry}. Manual pull secrets may be needed.[/yellow]")
     return ""
 
 
+def _write_private_file(path: Path, data: bytes) -> None:
+    """
+    Atomically replaces a file's contents, leaving it readable by the current user only.
+
+    The data is synced to a private temporary file next to `path`, which is then renamed over it,
+    so a crash leaves either the old or the new file, never a truncated one.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
 def save_config_to_file(config: DeploymentConfig, save_sensitive: bool = True) -> None:
     """Saves the deployment configuration to the user's config directory."""
     try:
@@ -662,11 +1178,11 @@ def save_config_to_file(config: DeploymentConfig, save_sensitive: bool = True) -
             config_dict["client_secret"] = ""
         config_dict.pop("registry_token", None)
         
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config_dict, f, indent=2)
+        # The file may hold the client secret, so keep it private to the user
+        _write_private_file(CONFIG_FILE, json.dumps(config_dict, indent=2).encode())
         
         console.print(f"[green]✅ Configuration saved to {CONFIG_FILE}[/green]")
-    except Exception as e:
+    except OSError as e:
         console.print(f"[yellow]⚠️ Failed to save configuration: {e}[/yellow]")
 
 
@@ -674,9 +1190,8 @@ def load_config_from_file() -> Optional[DeploymentConfig]:
     """Loads a deployment configuration from the user's config directory."""
     if not CONFIG_FILE.exists(): return None
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            data = json.load(f)
-        
+        data = json.loads(CONFIG_FILE.read_bytes())
+
         component_configs = {}
         if "components" in data:
             for comp_name, comp_data in data["components"].items():
@@ -690,11 +1205,20 @@ def load_config_from_file() -> Optional[DeploymentConfig]:
             local_registry=data.get("local_registry", ""),
             components=component_configs,
         )
-    except Exception as e:
+    except (OSError, ValueError, TypeError, AttributeError) as e:
         console.print(f"[yellow]⚠️ Failed to load configuration: {e}[/yellow]")
         return None
 
 
+def _ask_matching(question: str, pattern: "re.Pattern[str]", hint: str, **kwargs: Any) -> str:
+    """Prompts until the answer fully matches `pattern`, printing `hint` after each rejected answer."""
+    while True:
+        answer = Prompt.ask(question, **kwargs).strip()
+        if pattern.fullmatch(answer):
+            return answer
+        console.print(f"[red]{hint}[/red]")
+
+
 def wizard(selected_components: List[FalconComponent], existing_cfg: Optional[DeploymentConfig] = None) -> DeploymentConfig:
     """Runs an interactive wizard to gather all necessary deployment parameters."""
     console.print(Panel("Deployment Configuration Wizard", style="bold cyan"))
@@ -702,11 +1226,12 @@ def wizard(selected_components: List[FalconComponent], existing_cfg: Optional[De
     # Use existing values as defaults if available
     defaults = asdict(existing_cfg) if existing_cfg else {}
     
-    cid = Prompt.ask("CrowdStrike [bold]CID[/]", default=defaults.get("cid", os.getenv("FALCON_CID", ""))).strip()
-    client_id = Prompt.ask("Falcon API [bold]client_id[/]", default=defaults.get("client_id", os.getenv("FALCON_CLIENT_ID", ""))).strip()
+    # Typos in these only surface after authentication or the first registry call, so catch them here
+    cid = _ask_matching("CrowdStrike [bold]CID[/]", _CID_RE, "The CID is 32 hexadecimal characters, a dash and a 2-character checksum.", default=defaults.get("cid", os.getenv("FALCON_CID", "")))
+    client_id = _ask_matching("Falcon API [bold]client_id[/]", _CLIENT_ID_RE, "The client_id is 32 hexadecimal characters.", default=defaults.get("client_id", os.getenv("FALCON_CLIENT_ID", "")))
     client_secret = Prompt.ask("Falcon API [bold]client_secret[/]", default=defaults.get("client_secret", os.getenv("FALCON_CLIENT_SECRET", "")), password=True).strip()
     cloud_region = Prompt.ask("Falcon cloud region", choices=["us-1", "us-2", "eu-1", "us-gov-1", "us-gov-2"], default=defaults.get("cloud_region", DEFAULT_CLOUD_REGION))
-    local_registry = Prompt.ask("Local registry [bold]URL[/]", default=defaults.get("local_registry", DEFAULT_LOCAL_REGISTRY)).strip()
+    local_registry = _ask_matching("Local registry [bold]URL[/]", _REGISTRY_RE, "Enter the registry as host, host:port or host:port/path, without a scheme.", default=defaults.get("local_registry", DEFAULT_LOCAL_REGISTRY))
 
     components_config = {}
     for comp in selected_components:
@@ -743,40 +1268,46 @@ def wizard(selected_components: List[FalconComponent], existing_cfg: Optional[De
 
 def parse_args():
     parser = argparse.ArgumentParser(description="CrowdStrike Falcon Product Helm Deployment Helper")
-    parser.add_argument("--component", nargs='+', choices=[c.name.lower() for c in FalconComponent], help="Specify one or more components to manage.")
+    parser.add_argument("--component", nargs='+', choices=COMPONENT_CHOICES_LOWER, help="Specify one or more components to manage.")
     parser.add_argument("--no-sensitive", action="store_true", help="Do not save client_secret to configuration.")
     parser.add_argument("--uninstall", action="store_true", help="Uninstall specified components.")
+    parser.add_argument("--force", action="store_true", help="Copy images even if the tag already exists in the local registry.")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached registry tag lists and query the registry again.")
+    parser.add_argument("--values-dir", type=Path, default=CONFIG_DIR, help=f"Directory for the generated Helm values files (default: {CONFIG_DIR}).")
+    parser.add_argument("-y", "--yes", action="store_true", help="Proceed without confirmation: keep the saved configuration, approve upgrades and execute the plan.")
     return parser.parse_args()
 
 
+def confirm(question: str, default: bool = False, assume_yes: bool = False) -> bool:
+    """Asks a yes/no question, or answers it with yes without prompting when `assume_yes` is set."""
+    if assume_yes:
+        console.print(f"{question} [dim](yes)[/dim]")
+        return True
+    return Confirm.ask(question, default=default)
+
+
 def choose_components(action: str) -> List[FalconComponent]:
     """Interactively ask the user to choose one or more components."""
     console.print(Panel(f"Choose Components to {action.capitalize()}", style="bold blue"))
-    choices = {str(i + 1): comp for i, comp in enumerate(FalconComponent)}
-    for i, comp in choices.items():
-        console.print(f"[cyan]{i}[/cyan]: {comp.value}")
+    console.print(COMPONENT_INDEX_DISPLAY)
 
     while True:
         try:
-            prompt_text = "Select component(s). Enter one or more numbers separated by a comma (e.g., 1, 2)"
+            prompt_text = "Select component(s). Enter one or more numbers separated by commas or spaces (e.g., 1, 2)"
             raw_input = Prompt.ask(prompt_text)
 
-            # Process the input to get unique indices
-            selected_indices = {idx.strip() for idx in raw_input.split(',') if idx.strip()}
+            # Accept commas, semicolons and whitespace as separators
+            selected_indices = set(_SELECTION_SEPARATOR_RE.split(raw_input.strip())) - {""}
 
             if not selected_indices:
                 raise InvalidResponse("You must select at least one component.")
 
-            # Validate and map indices to components
-            selected_components = []
-            for index in selected_indices:
-                if index not in choices:
-                    raise InvalidResponse(f"'{index}' is not a valid choice. Please choose from {list(choices.keys())}.")
-                selected_components.append(choices[index])
+            invalid = sorted(selected_indices - COMPONENT_INDEX.keys())
+            if invalid:
+                raise InvalidResponse(f"'{invalid[0]}' is not a valid choice. Please choose from {list(COMPONENT_INDEX)}.")
 
-            # Return a unique list of components, maintaining the original enum order
-            unique_selected = sorted(list(set(selected_components)), key=lambda c: list(FalconComponent).index(c))
-            return unique_selected
+            # Walk the index so the result keeps the enum order without sorting
+            return [component for index, component in COMPONENT_INDEX.items() if index in selected_indices]
 
         except InvalidResponse as e:
             console.print(f"[red]Invalid input: {e}. Please try again.[/red]")
@@ -803,13 +1334,11 @@ def generate_uninstall_plan(components: List[FalconComponent]) -> List[Command]:
             component=comp,
             description=f"Uninstall Helm release '{strategy.release_name}'",
             cmd_list=["helm", "uninstall", strategy.release_name, "-n", namespace],
-            capture_output=False
         ))
         commands.append(Command(
             component=comp,
             description=f"Delete namespace '{namespace}'",
             cmd_list=["kubectl", "delete", "namespace", namespace, "--ignore-not-found"],
-            capture_output=False,
             can_fail=True
         ))
     return commands
@@ -830,29 +1359,46 @@ def main() -> None:
         console.print(Panel("Falcon Product Uninstaller", style="bold red"))
         uninstall_commands = generate_uninstall_plan(selected_components)
         if uninstall_commands:
-            execute_commands_wizard(uninstall_commands, plan_title="Uninstallation Plan")
+            execute_commands_wizard(uninstall_commands, plan_title="Uninstallation Plan", assume_yes=args.yes)
         
-        if Confirm.ask("\nDo you want to remove the unified configuration file?", default=False):
+        # Removing the saved configuration is optional, so --yes leaves it in place
+        if not args.yes and Confirm.ask("\nDo you want to remove the unified configuration file?", default=False):
             CONFIG_FILE.unlink(missing_ok=True)
             console.print("[green]✅ Configuration file removed.[/green]")
         sys.exit(0)
     
-    if shutil.which("docker") is None:
+    if _which("docker") is None:
         console.print("\n[red bold]❌ Docker is required for image operations.[/red bold]")
         raise PrerequisiteError("Docker is not installed or not in PATH.")
+    # Docker's "What's next" hints would only clutter the streamed pull/push output
+    os.environ.setdefault("DOCKER_CLI_HINTS", "false")
 
     console.print("\n[yellow]Checking prerequisites and setting up Helm repository...[/yellow]")
-    check_binary("helm", MIN_HELM_VERSION)
-    check_binary("kubectl", MIN_KUBECTL_VERSION)
-    check_cluster()
-    setup_helm_repo()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        # Query both client versions at once; check_binary then reads them from get_binary_version's cache
+        concurrent.futures.wait([executor.submit(get_binary_version, name) for name in ("helm", "kubectl")])
+        check_binary("helm", MIN_HELM_VERSION)
+        check_binary("kubectl", MIN_KUBECTL_VERSION)
+        # The cluster probe and the chart index download are independent, so run them side by side
+        repo_setup = executor.submit(setup_helm_repo)
+        check_cluster()
+        repo_setup.result()
 
     cfg = load_config_from_file()
-    if not cfg or Confirm.ask("\nAn existing configuration was found. Do you want to re-configure?", default=False):
+    if not cfg or (not args.yes and Confirm.ask("\nAn existing configuration was found. Do you want to re-configure?", default=False)):
         cfg = wizard(selected_components, existing_cfg=cfg)
     
         save_config_to_file(cfg, save_sensitive=not args.no_sensitive)
     
+    # Components pinned to a version that is already deployed need neither the API nor the registry
+    up_to_date = [c for c in selected_components if c.name in cfg.components and is_pinned_version_deployed(c, cfg.components[c.name])]
+    for component in up_to_date:
+        console.print(f"[green]✅ {component.value} already runs the pinned version {cfg.components[component.name].image_tag}. Nothing to do.[/green]")
+    selected_components = [c for c in selected_components if c not in up_to_date]
+    if not selected_components:
+        console.print("\n[green]✅ All components are up-to-date. No actions needed.[/green]")
+        return
+
     console.print("\n[yellow]Authenticating with CrowdStrike and checking network...[/yellow]")
     if not cfg.client_secret:
         cfg.client_secret = Prompt.ask("Please enter Falcon API [bold]client_secret[/]", password=True).strip()
@@ -860,63 +1406,103 @@ def main() -> None:
             raise PrerequisiteError("Client secret is required to proceed.")
 
     api_base, cloud_tag, cs_registry = get_cloud_api_config(cfg.cloud_region)
-    oauth_token = get_oauth_token(cfg.client_id, cfg.client_secret, api_base)
-    cs_username, cs_password = get_registry_credentials(oauth_token, api_base, cfg.cid)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        # Authenticating only needs the API, so it runs while the cloud endpoints are probed
+        login = executor.submit(get_registry_login, cfg.client_id, cfg.client_secret, api_base, cfg.cid, use_cache=not args.no_sensitive)
+        network_ok = check_network_connectivity(cfg.cloud_region)
+        # Settle the login before prompting, so bad credentials are reported first and declining exits at once
+        cs_username, cs_password, from_cache = login.result()
+    if not network_ok:
+        if not confirm("\n[yellow]Network connectivity issues detected. Do you want to continue anyway?[/yellow]", assume_yes=args.yes):
+            sys.exit(1)
+
     cfg.registry_token = generate_pull_token(cfg.local_registry)
+    latest_components = [c for c in selected_components if c.name in cfg.components and cfg.components[c.name].image_tag == LATEST_IMAGE_TAG_KEYWORD]
 
-    try:
-        run(["docker", "login", cs_registry, "-u", cs_username, "--password-stdin"], capture=True, stdin_input=cs_password)
-    except subprocess.CalledProcessError as e:
-        raise APIError(f"Failed to login to CrowdStrike registry {cs_registry}.", e.stderr)
+    # Cached registry credentials can be revoked before they expire; if the registry rejects them, fetch new ones once
+    for refresh_login in (False, True):
+        if refresh_login:
+            cs_username, cs_password, from_cache = get_registry_login(cfg.client_id, cfg.client_secret, api_base, cfg.cid, use_cache=not args.no_sensitive, refresh=True)
+        try:
+            # skopeo authenticates with its own authfile; Docker and crane both use the session stored by docker login
+            if _which("skopeo"):
+                # Nothing else may contact the registry before the copies, so check cached credentials while a retry is still possible
+                if from_cache:
+                    check_registry_credentials(cs_registry, COMPONENT_STRATEGIES[selected_components[0]].get_image_path(cloud_tag), cs_username, cs_password)
+            else:
+                docker_login(cs_registry, cs_username, cs_password)
 
-    if not check_network_connectivity(cfg.cloud_region):
-        if not Confirm.ask("\n[yellow]Network connectivity issues detected. Do you want to continue anyway?[/yellow]", default=False):
-            sys.exit(1)
+            # Resolve every 'latest' tag up front so the registry round trips overlap
+            latest_tags = fetch_latest_tags(latest_components, cs_registry, cloud_tag, cs_username, cs_password, refresh=args.refresh)
+            break
+        except RegistryAuthError:
+            # Only cached credentials can be stale; fresh ones being rejected is a real error
+            if not from_cache:
+                raise
+            console.print("[yellow]The registry rejected the cached credentials, requesting new ones...[/yellow]")
 
     all_commands: List[Command] = []
 
-    # --- Process each component ---
+    # --- Decide what to do for each component ---
+    planned: List[tuple[FalconComponent, ComponentConfig, bool]] = []
     for component in selected_components:
         console.print(Panel(f"Processing: {component.value}", style="bold green"))
-        
+
         strategy = COMPONENT_STRATEGIES[component]
         comp_cfg = cfg.components.get(component.name)
         if not comp_cfg:
             console.print(f"[yellow]⚠️ No configuration for {component.value} found. Skipping.[/yellow]")
             continue
-            
+
         is_new_install = not check_helm_release_exists(strategy.release_name, comp_cfg.namespace)
-        
+
         target_tag = comp_cfg.image_tag
         if target_tag == LATEST_IMAGE_TAG_KEYWORD:
-            latest_tag = get_latest_image_tag(component, cs_registry, cloud_tag, cs_username, cs_password)
+            latest_tag = latest_tags.get(component)
             if latest_tag:
                 target_tag = latest_tag
                 console.print(f"Resolved 'latest' to version: [bold green]{target_tag}[/bold green]")
             else:
                 console.print(f"[red]❌ Could not resolve 'latest' tag for {component.value}. Please specify a version.[/red]")
                 continue
-        
+
         if not is_new_install:
             installed_tag = get_installed_image_tag(strategy.release_name, comp_cfg.namespace, component)
             console.print(f"Installed version: [bold]{installed_tag or 'unknown'}[/bold], Target version: [bold green]{target_tag}[/bold green]")
-            if installed_tag and version_to_tuple(target_tag) <= version_to_tuple(installed_tag):
+            if installed_tag and is_version_deployed(target_tag, installed_tag):
                 console.print("[green]✅ Already running the latest target version. Nothing to do.[/green]")
                 continue
-            if not Confirm.ask(f"Upgrade from [yellow]{installed_tag}[/yellow] to [green]{target_tag}[/green]?", default=True):
+            if not confirm(f"Upgrade from [yellow]{installed_tag}[/yellow] to [green]{target_tag}[/green]?", default=True, assume_yes=args.yes):
                 continue
-        
+
         comp_cfg.image_tag = target_tag
-        local_image_repo, actual_tag = download_and_push_image(component, cfg, comp_cfg)
-        comp_cfg.image_repo = local_image_repo
-        comp_cfg.image_tag = actual_tag
-        
-        values_yaml = yaml.dump(strategy.to_values_dict(comp_cfg, cfg, args.no_sensitive), default_flow_style=False)
-        out_path = CONFIG_DIR / f"{strategy.release_name}-values.yml"
-        out_path.write_text(values_yaml)
+        planned.append((component, comp_cfg, is_new_install))
+
+    # --- Mirror all images concurrently under one progress display ---
+    if planned:
+        with _progress() as progress, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=min(len(planned), MAX_PARALLEL_IMAGE_COPIES)) as executor:
+            futures = {
+                executor.submit(download_and_push_image, component, cfg, comp_cfg, progress, (cs_username, cs_password), args.force): comp_cfg
+                for component, comp_cfg, _ in planned
+            }
+            for future in concurrent.futures.as_completed(futures):
+                comp_cfg = futures[future]
+                comp_cfg.image_repo, comp_cfg.image_tag = future.result()
+
+    # --- Write values files and generate commands for later ---
+    # Absolute, so the generated helm commands also work when copied elsewhere
+    values_dir = args.values_dir.expanduser().resolve()
+    if planned:
+        values_dir.mkdir(parents=True, exist_ok=True)
+    for component, comp_cfg, is_new_install in planned:
+        strategy = COMPONENT_STRATEGIES[component]
+        out_path = values_dir / f"{strategy.release_name}-values.yml"
+        # Values files carry the CID and registry pull token, so they get the same private, atomic write as the config
+        _write_private_file(out_path, dump_yaml(strategy.to_values_dict(comp_cfg, cfg, args.no_sensitive), default_flow_style=False).encode())
         console.print(f"✅ Helm values file written to [green]{out_path}[/green]")
 
-        # --- Generate and store commands for later ---
         if is_new_install:
             all_commands.extend(strategy.get_pre_install_commands(comp_cfg))
 
@@ -925,66 +1511,195 @@ def main() -> None:
 
     # --- Save config and offer to execute commands ---
     save_config_to_file(cfg, save_sensitive=not args.no_sensitive)
-    execute_commands_wizard(all_commands)
+    execute_commands_wizard(all_commands, assume_yes=args.yes)
 
     console.print("\n[bold]✨ All selected components processed.[/bold]")
 
 
-def execute_commands_wizard(commands: List[Command], plan_title: str = "Deployment Plan"):
+@functools.lru_cache(maxsize=None)
+def _clipboard_command() -> Optional[List[str]]:
+    """Returns the command that copies stdin to the clipboard, or None if no clipboard tool is installed."""
+    if _which("pbcopy"):
+        return ["pbcopy"]
+    if os.environ.get("WAYLAND_DISPLAY") and _which("wl-copy"):
+        return ["wl-copy"]
+    if _which("xclip"):
+        return ["xclip", "-selection", "clipboard"]
+    return None
+
+
+def _print_output_block(out: Console, block: bytes) -> None:
+    text = "\n".join(f"  {line.strip()}" for line in block.decode(errors="replace").splitlines())
+    out.print(text, style="dim", markup=False, highlight=False)
+
+
+def _stream_output_blocking(process: subprocess.Popen, out: Console, timeout: Optional[float] = None) -> None:
+    """
+    stream_output for Windows, where select() only works on sockets, not pipes.
+
+    Reads block until output arrives, so each block is printed as it comes and the timeout is
+    enforced by killing the process from a timer.
+
+    Raises:
+        subprocess.TimeoutExpired: If `timeout` seconds pass before the output ends; the process is killed.
+    """
+    timed_out = threading.Event()
+
+    def kill() -> None:
+        timed_out.set()
+        process.kill()
+
+    timer = threading.Timer(timeout, kill) if timeout is not None else None
+    if timer:
+        timer.start()
+    try:
+        fd = process.stdout.fileno()
+        pending = b""
+        while True:
+            chunk = os.read(fd, OUTPUT_CHUNK_SIZE)
+            if not chunk:
+                break
+            block, newline, pending = (pending + chunk).rpartition(b"\n")
+            if newline:
+                _print_output_block(out, block)
+        if pending.strip():
+            _print_output_block(out, pending)
+        process.wait()
+    finally:
+        if timer:
+            timer.cancel()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(process.args, timeout)
+
+
+def stream_output(process: subprocess.Popen, out: Console, timeout: Optional[float] = None) -> None:
+    """
+    Echoes a running command's output until it exits.
+
+    Output is read in blocks straight from the pipe and printed at most every
+    OUTPUT_FLUSH_INTERVAL_S, so a chatty command costs a bounded number of repaints of any live
+    progress display. A trailing partial line is held back until the rest of it (or EOF) arrives.
+
+    Raises:
+        subprocess.TimeoutExpired: If `timeout` seconds pass before the output ends; the process is killed.
+    """
+    if sys.platform == "win32":
+        _stream_output_blocking(process, out, timeout)
+        return
+    fd = process.stdout.fileno()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    pending = b""
+    last_flush = 0.0
+    while True:
+        # Block until output arrives, or only until the next flush or the deadline is due
+        wait = None
+        if b"\n" in pending:
+            wait = max(0.0, last_flush + OUTPUT_FLUSH_INTERVAL_S - time.monotonic())
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                process.kill()
+                process.wait()
+                raise subprocess.TimeoutExpired(process.args, timeout)
+            wait = remaining if wait is None else min(wait, remaining)
+        if select.select([fd], [], [], wait)[0]:
+            chunk = os.read(fd, OUTPUT_CHUNK_SIZE)
+            if not chunk:
+                break
+            pending += chunk
+        if time.monotonic() - last_flush >= OUTPUT_FLUSH_INTERVAL_S:
+            block, newline, rest = pending.rpartition(b"\n")
+            if newline:
+                _print_output_block(out, block)
+                pending = rest
+                last_flush = time.monotonic()
+    if pending.strip():
+        _print_output_block(out, pending)
+    process.wait()
+
+
+def run_verification_command(cmd: Command) -> bool:
+    """Runs a verification or diagnostic command, streaming its output. Returns True if it succeeded."""
+    console.print(f"\n--- Verifying: {cmd.description} ---")
+    try:
+        process = _spawn(cmd.cmd_list, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        stream_output(process, console, timeout=VERIFY_TIMEOUT_S)
+    except FileNotFoundError:
+        console.print(f"\n[bold red]❌ Command not found: {cmd.cmd_list[0]}. Is it installed and in your PATH?[/bold red]")
+        return False
+    except subprocess.TimeoutExpired:
+        console.print(f"\n[bold red]❌ Verification timed out: {escape(cmd.rendered)}[/bold red]")
+        return False
+    if process.returncode != 0:
+        console.print(f"\n[bold red]❌ Verification command failed: {escape(cmd.rendered)}[/bold red]")
+        return False
+    return True
+
+
+def execute_commands_wizard(commands: List[Command], plan_title: str = "Deployment Plan", assume_yes: bool = False):
     """Displays a plan and interactively executes a list of commands."""
     if not commands:
         console.print("\n[green]✅ All components are up-to-date. No actions needed.[/green]")
         return
 
-    # Group commands by component for display and execution
-    grouped_commands = {}
+    # Group commands by component into (deployment, verification) steps for display and execution
+    grouped_commands: Dict[FalconComponent, tuple[List[Command], List[Command]]] = defaultdict(lambda: ([], []))
     for cmd in commands:
-        if cmd.component not in grouped_commands:
-            grouped_commands[cmd.component] = []
-        grouped_commands[cmd.component].append(cmd)
-
-    console.print(Panel(plan_title, style="bold green", expand=False))
-    final_command_str_list = []
-    for component, cmds in grouped_commands.items():
-        console.print(f"\n[bold blue]Component: {component.value}[/bold blue]")
-        for cmd in cmds:
-            action_type = "Verification" if cmd.is_verification else "Deployment"
-            cmd_str = ' '.join(cmd.cmd_list)
-            console.print(f"  - {action_type}: {cmd.description} -> [dim]`{cmd_str}`[/dim]")
-            if not cmd.is_verification:
-                final_command_str_list.append(cmd_str)
-
-    if not Confirm.ask("\nDo you want to execute this deployment plan now?", default=False):
+        grouped_commands[cmd.component][1 if cmd.is_verification else 0].append(cmd)
+
+    plan_table = Table(title=plan_title, title_style="bold green", expand=True)
+    plan_table.add_column("Component", style="bold blue", ratio=1)
+    plan_table.add_column("Step", ratio=1)
+    plan_table.add_column("Description", ratio=1)
+    plan_table.add_column("Command", style="dim", overflow="fold", ratio=3)
+    for component, (deployment_steps, verification_steps) in grouped_commands.items():
+        steps = deployment_steps + verification_steps
+        for position, cmd in enumerate(steps):
+            action_type = "Deployment"
+            if cmd.is_verification:
+                action_type = "Verification (on failure)" if cmd.only_on_failure else "Verification"
+            plan_table.add_row(component.value if position == 0 else "", action_type, cmd.description, escape(cmd.rendered),
+                               end_section=position == len(steps) - 1)
+
+    console.print(plan_table)
+
+    if not confirm("\nDo you want to execute this deployment plan now?", assume_yes=assume_yes):
         console.print("\nExecution cancelled. Below are the commands to run manually.")
-        final_command_str = "\n".join(final_command_str_list)
+        final_command_str = "\n".join(
+            f"cat <<'EOF' | {cmd.rendered}\n{cmd.stdin_input}EOF" if cmd.stdin_input is not None else cmd.rendered
+            for deployment_steps, _ in grouped_commands.values() for cmd in deployment_steps
+        )
         console.print(f"\n[yellow]--- Manual Commands ---[/yellow]")
         console.print(final_command_str)
         console.print(f"[yellow]-----------------------[/yellow]\n")
-        # Copy to clipboard
-        if shutil.which("pbcopy"):
-            subprocess.run("pbcopy", input=final_command_str, text=True)
-            console.print("\n[grey]Deployment commands copied to clipboard.[/grey]")
-        elif shutil.which("xclip"):
-            subprocess.run(["xclip", "-selection", "clipboard"], input=final_command_str, text=True)
-            console.print("\n[grey]Deployment commands copied to clipboard.[/grey]")
+        clipboard_cmd = _clipboard_command()
+        if clipboard_cmd:
+            try:
+                copied = subprocess.run(clipboard_cmd, input=final_command_str, text=True, check=False, **_spawn_options(clipboard_cmd)).returncode == 0
+            except OSError:
+                copied = False
+            if copied:
+                console.print("\n[grey]Deployment commands copied to clipboard.[/grey]")
         return
 
-    for component, cmds in grouped_commands.items():
+    # The plan installs or removes releases, so any later lookup must list them again
+    _helm_release_index.cache_clear()
+    get_installed_image_tag.cache_clear()
+    for component, (deployment_steps, verification_steps) in grouped_commands.items():
         console.print(f"\n--- Executing plan for [bold]{component.value}[/bold] ---")
 
-        deployment_steps = [c for c in cmds if not c.is_verification]
-        verification_steps = [c for c in cmds if c.is_verification]
-
-        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), BarColumn(), TimeElapsedColumn(), console=console, transient=False) as progress:
+        with _progress(transient=False) as progress:
             task = progress.add_task(f"Deploying {component.value}", total=len(deployment_steps))
             for cmd in deployment_steps:
                 progress.update(task, description=f"Running: {cmd.description}")
                 try:
                     # Execute and show live output
-                    process = subprocess.Popen(cmd.cmd_list, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-                    for line in iter(process.stdout.readline, ''):
-                        progress.console.print(f"[dim]  {line.strip()}[/dim]")
-                    process.wait()
+                    process = _spawn(cmd.cmd_list, stdin=subprocess.PIPE if cmd.stdin_input is not None else None,
+                                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+                    if cmd.stdin_input is not None:
+                        process.stdin.write(cmd.stdin_input.encode())
+                        process.stdin.close()
+                    stream_output(process, progress.console)
                     if process.returncode != 0:
                         if not cmd.can_fail:
                             raise subprocess.CalledProcessError(process.returncode, cmd.cmd_list)
@@ -992,7 +1707,10 @@ def execute_commands_wizard(commands: List[Command], plan_title: str = "Deployme
                             progress.console.print(f"[yellow]  ⚠️  Command failed but was marked as non-critical. Continuing.[/yellow]")
                 except subprocess.CalledProcessError as e:
                     progress.stop()
-                    console.print(f"\n[bold red]❌ Command failed with exit code {e.returncode}: {' '.join(cmd.cmd_list)}[/bold red]")
+                    console.print(f"\n[bold red]❌ Command failed with exit code {e.returncode}: {escape(cmd.rendered)}[/bold red]")
+                    for diagnostic in verification_steps:
+                        if diagnostic.only_on_failure:
+                            run_verification_command(diagnostic)
                     console.print("[bold red]Aborting deployment.[/bold red]")
                     return
                 except FileNotFoundError:
@@ -1001,39 +1719,16 @@ def execute_commands_wizard(commands: List[Command], plan_title: str = "Deployme
                     return
                 progress.advance(task)
         
-        if verification_steps:
+        if any(not cmd.only_on_failure for cmd in verification_steps):
             console.print(f"\n[green]✅ Plan for {component.value} executed successfully. Verifying...[/green]")
         else:
             console.print(f"\n[green]✅ Plan for {component.value} executed successfully.[/green]")
 
         all_verifications_passed = True
         for cmd in verification_steps:
-            console.print(f"\n--- Verifying: {cmd.description} ---")
-            try:
-                if cmd.capture_output:
-                    result = subprocess.run(cmd.cmd_list, capture_output=True, text=True, check=True, timeout=120)
-                    console.print(result.stdout.strip() or "[dim](No output)[/dim]")
-                    if result.stderr.strip():
-                        console.print(f"[dim]STDERR: {result.stderr.strip()}[/dim]")
-                else:
-                    process = subprocess.Popen(cmd.cmd_list, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-                    for line in iter(process.stdout.readline, ''):
-                        console.print(f"[dim]  {line.strip()}[/dim]")
-                    process.wait()
-                    if process.returncode != 0:
-                        raise subprocess.CalledProcessError(process.returncode, cmd.cmd_list)
-
-            except subprocess.CalledProcessError as e:
-                all_verifications_passed = False
-                console.print(f"\n[bold red]❌ Verification command failed: {' '.join(cmd.cmd_list)}[/bold red]")
-                if hasattr(e, 'stdout') and e.stdout: console.print(f"[bold]STDOUT:[/bold]\n{e.stdout.strip()}")
-                if hasattr(e, 'stderr') and e.stderr: console.print(f"[bold]STDERR:[/bold]\n{e.stderr.strip()}")
-            except (FileNotFoundError, subprocess.TimeoutExpired) as e:
-                all_verifications_passed = False
-                if isinstance(e, FileNotFoundError):
-                    console.print(f"\n[bold red]❌ Command not found: {cmd.cmd_list[0]}. Is it installed and in your PATH?[/bold red]")
-                else:
-                    console.print(f"\n[bold red]❌ Verification timed out: {' '.join(cmd.cmd_list)}[/bold red]")
+            if cmd.only_on_failure and all_verifications_passed:
+                continue
+            all_verifications_passed &= run_verification_command(cmd)
 
         if not all_verifications_passed:
             console.print(f"\n[yellow]⚠️ Some verification steps for {component.value} failed. Please check the logs above manually.[/yellow]")